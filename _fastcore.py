@@ -0,0 +1,88 @@
+"""
+Character-compare kernels for TypeTrainer's live view.
+
+err_count / mark_mismatch take two ASCII buffers (uint8 arrays, or bytes when
+NumPy is missing) and are compiled with Numba when it is installed, falling
+back to NumPy if the JIT build fails. test_fastcore.py checks every variant
+against the pure-Python reference kernels.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    import numba
+except Exception:
+    numba = None
+
+# mark_mismatch codes
+CORRECT, WRONG, UNSEEN = 0, 1, 2
+
+# ----------------------- Reference kernels ----------------------- #
+
+def _err_count_ref(t, u):
+    """Mismatches over the common prefix plus the length difference."""
+    m = min(len(t), len(u))
+    errors = 0
+    for i in range(m):
+        if t[i] != u[i]:
+            errors += 1
+    return errors + abs(len(t) - len(u))
+
+def _mark_mismatch_ref(t, u, out):
+    """Fill out[i] with CORRECT/WRONG/UNSEEN for each target position."""
+    m = min(len(t), len(u))
+    for i in range(len(t)):
+        if i >= m:
+            out[i] = UNSEEN
+        elif t[i] == u[i]:
+            out[i] = CORRECT
+        else:
+            out[i] = WRONG
+    return out
+
+# ----------------------- NumPy kernels ----------------------- #
+
+def _err_count_np(t, u):
+    m = min(t.size, u.size)
+    return int(np.count_nonzero(t[:m] != u[:m])) + abs(t.size - u.size)
+
+def _mark_mismatch_np(t, u, out):
+    m = min(t.size, u.size)
+    out[:m] = t[:m] != u[:m]  # True -> WRONG (1), False -> CORRECT (0)
+    out[m:] = UNSEEN
+    return out
+
+# ----------------------- Numba JIT ----------------------- #
+
+JIT = False
+if np is None:
+    _err_count, _mark_mismatch = _err_count_ref, _mark_mismatch_ref
+else:
+    _err_count, _mark_mismatch = _err_count_np, _mark_mismatch_np
+    if numba is not None:
+        try:
+            # Compile now for the read-only np.frombuffer views callers pass,
+            # so a failed build falls back here instead of at the first frame.
+            _ro = numba.typeof(np.frombuffer(b"a", np.uint8))
+            _ec = numba.njit(cache=True)(_err_count_ref)
+            _ec.compile((_ro, _ro))
+            _mm = numba.njit(cache=True)(_mark_mismatch_ref)
+            _mm.compile((_ro, _ro, numba.uint8[::1]))
+            _err_count, _mark_mismatch, JIT = _ec, _mm, True
+        except Exception:
+            pass
+
+def err_count(t, u) -> int:
+    """Number of typing errors of `u` against target `t`."""
+    return int(_err_count(t, u))
+
+def mark_mismatch(t, u, out=None):
+    """Per-position mask over `t`: CORRECT, WRONG, or UNSEEN (not yet typed)."""
+    if out is None:
+        out = np.empty(len(t), np.uint8) if np is not None else bytearray(len(t))
+    return _mark_mismatch(t, u, out)
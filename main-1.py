@@ -12,11 +12,16 @@ Raw WPM counts all typed chars; Net WPM multiplies by accuracy.
 """
 
 from __future__ import annotations
+import atexit
 import os
+import queue
 import random
+import shutil
 import sys
 import textwrap
+import threading
 import time
+from contextlib import contextmanager
 
 # ----------------------- MySQL Setup ----------------------- #
 DB_HOST = "localhost"
@@ -27,18 +32,26 @@ DB_TABLE = "sessions"
 
 try:
     import mysql.connector as mysql
+    from mysql.connector import pooling
 except Exception:
-    mysql = None  
+    mysql = None
+    pooling = None
+
+# Pooled connections (DB already selected); None when MySQL is unavailable.
+POOL = None
 
 def db_connect():
-    """Connect to MySQL server (not yet selecting a DB)."""
-    if mysql is None:
-        raise RuntimeError("mysql-connector-python is not installed. Install it with: pip install mysql-connector-python")
-    return mysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
+    """Check out a pooled connection to the TypeTrainer database."""
+    if POOL is None:
+        raise RuntimeError("MySQL connection pool is not initialised (see db_init).")
+    return POOL.get_connection()
 
 def db_init():
-    """Create database and table if they don't exist."""
-    conn = db_connect()
+    """Create database and table if they don't exist, then open the connection pool."""
+    global POOL
+    if mysql is None:
+        raise RuntimeError("mysql-connector-python is not installed. Install it with: pip install mysql-connector-python")
+    conn = mysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
     cur = conn.cursor()
     try:
         cur.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
@@ -58,61 +71,197 @@ def db_init():
             )
             """
         )
-        conn.commit()
-    finally:
-        cur.close()
-        conn.close()
-
-def save_session(res: dict):
-    """Insert one session into MySQL."""
-    conn = db_connect()
-    cur = conn.cursor()
-    try:
-        cur.execute(f"USE {DB_NAME}")
+        # MySQL has no CREATE INDEX IF NOT EXISTS, so check information_schema first.
         cur.execute(
-            f"""INSERT INTO {DB_TABLE}
-                (mode, wpm, raw_wpm, accuracy, errors, seconds, timestamp, text_len)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s)""",
-            (
-                res["mode"], res["wpm"], res["raw_wpm"], res["accuracy"], res["errors"],
-                res["seconds"], res["timestamp"], res["text_len"]
-            ),
+            """SELECT COUNT(*) FROM information_schema.statistics
+               WHERE table_schema = %s AND table_name = %s AND index_name = 'idx_ts'""",
+            (DB_NAME, DB_TABLE),
         )
+        if not cur.fetchone()[0]:
+            cur.execute(f"CREATE INDEX idx_ts ON {DB_TABLE} (timestamp)")
         conn.commit()
     finally:
         cur.close()
         conn.close()
+    POOL = pooling.MySQLConnectionPool(
+        pool_name="tt", pool_size=4,
+        host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME,
+        autocommit=False,
+    )
 
-def load_history():
-    """Load all sessions (oldest→newest) from MySQL."""
-    conn = db_connect()
-    cur = conn.cursor(dictionary=True)
+# Completed sessions are handed to a background writer so the UI never waits on MySQL.
+_WRITE_Q: queue.Queue = queue.Queue()
+# The writer groups up to _BATCH_SIZE rows arriving within _BATCH_WAIT seconds
+# into one transaction, so the per-commit log flush is paid once per batch.
+_BATCH_SIZE = 64
+_BATCH_WAIT = 0.05
+_DEBUG = os.environ.get("TYPETRAINER_DEBUG") == "1"
+
+# Built once; the writer keeps it prepared server-side on its own connection.
+_INSERT_SQL = (
+    f"INSERT INTO {DB_TABLE} "
+    "(mode, wpm, raw_wpm, accuracy, errors, seconds, timestamp, text_len) "
+    "VALUES (%s,%s,%s,%s,%s,%s,%s,%s)"
+)
+_insert_conn = None
+_INSERT_CUR = None
+
+def _open_insert_cursor():
+    """(Re)acquire the writer's pooled connection and its prepared INSERT cursor."""
+    global _insert_conn, _INSERT_CUR
+    if _insert_conn is not None:
+        try:
+            _insert_conn.close()
+        except Exception:
+            pass
+    _INSERT_CUR = None
+    _insert_conn = db_connect()
+    _INSERT_CUR = _insert_conn.cursor(prepared=True)
+
+def _do_insert(rows):
+    """Write a batch of session tuples to MySQL in a single transaction."""
+    if _INSERT_CUR is None:
+        _open_insert_cursor()
     try:
-        cur.execute(f"USE {DB_NAME}")
-        cur.execute(
-            f"""SELECT mode, wpm, raw_wpm, accuracy, errors, seconds, timestamp, text_len
-                FROM {DB_TABLE}
-                ORDER BY id ASC"""
-        )
-        return list(cur.fetchall())
-    finally:
-        cur.close()
-        conn.close()
+        _INSERT_CUR.executemany(_INSERT_SQL, rows)
+        _insert_conn.commit()
+    except (mysql.errors.OperationalError, mysql.errors.InterfaceError):
+        # Connection went away (server restart, wait_timeout): reconnect and retry once.
+        _open_insert_cursor()
+        _INSERT_CUR.executemany(_INSERT_SQL, rows)
+        _insert_conn.commit()
+    except Exception:
+        _insert_conn.rollback()
+        raise
+
+def _writer():
+    """Daemon loop: group queued rows into batches and insert each batch."""
+    try:
+        _open_insert_cursor()
+    except Exception as e:
+        print(f"Session writer could not connect yet: {e}", file=sys.stderr)
+    while True:
+        rows = [_WRITE_Q.get()]
+        while len(rows) < _BATCH_SIZE:
+            try:
+                rows.append(_WRITE_Q.get(timeout=_BATCH_WAIT))
+            except queue.Empty:
+                break
+        if _DEBUG:
+            print(f"[writer] batch={len(rows)} queued={_WRITE_Q.qsize()}", file=sys.stderr)
+        try:
+            _do_insert(rows)
+        except Exception as e:
+            print(f"Failed to save {len(rows)} session(s): {e}", file=sys.stderr)
+        finally:
+            for _ in rows:
+                _WRITE_Q.task_done()
+
+def save_session(res: dict):
+    """Queue one session for insertion into MySQL (returns immediately)."""
+    if POOL is None:
+        return
+    _WRITE_Q.put((
+        res["mode"], res["wpm"], res["raw_wpm"], res["accuracy"], res["errors"],
+        res["seconds"], res["timestamp"], res["text_len"]
+    ))
+
+def load_history(limit=None, offset=0):
+    """Load sessions (oldest→newest) from MySQL.
+
+    With `limit`, return one page of the newest rows, skipping the newest
+    `offset`. The ORDER BY is served by the primary key on id, so no sort
+    is needed either way.
+    """
+    if POOL is None:
+        return []
+    with db_connect() as conn:
+        cur = conn.cursor(dictionary=True)
+        try:
+            if limit is None:
+                cur.execute(
+                    f"""SELECT mode, wpm, raw_wpm, accuracy, errors, seconds, timestamp, text_len
+                        FROM {DB_TABLE}
+                        ORDER BY id ASC"""
+                )
+                return list(cur.fetchall())
+            cur.execute(
+                f"""SELECT mode, wpm, raw_wpm, accuracy, errors, seconds, timestamp, text_len
+                    FROM {DB_TABLE}
+                    ORDER BY id DESC
+                    LIMIT %s OFFSET %s""",
+                (limit, offset),
+            )
+            rows = cur.fetchall()
+            rows.reverse()
+            return rows
+        finally:
+            cur.close()
+
+def load_recent(n=10):
+    """Load the newest n sessions (returned oldest→newest)."""
+    return load_history(limit=n)
+
+def load_aggregates(recent=10):
+    """Session count, best WPM (and its mode), and avg WPM of the newest `recent` rows."""
+    if POOL is None:
+        return {"count": 0, "best_wpm": None, "best_mode": None, "avg_recent": None}
+    with db_connect() as conn:
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(
+                f"""SELECT COUNT(*) AS count,
+                           MAX(wpm) AS best_wpm,
+                           (SELECT mode FROM {DB_TABLE} ORDER BY wpm DESC, id ASC LIMIT 1) AS best_mode,
+                           AVG(CASE WHEN rn <= %s THEN wpm END) AS avg_recent
+                    FROM (SELECT wpm, ROW_NUMBER() OVER (ORDER BY id DESC) AS rn
+                          FROM {DB_TABLE}) AS ranked""",
+                (recent,),
+            )
+            return cur.fetchone()
+        finally:
+            cur.close()
+
+def load_chart_values(count, width=50):
+    """WPM values (oldest→newest), downsampled server-side to about `width` points."""
+    if POOL is None or not count:
+        return []
+    step = max(1, count // width)
+    with db_connect() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                f"""SELECT wpm FROM {DB_TABLE}
+                    WHERE MOD(id, %s) = 0
+                    ORDER BY id ASC""",
+                (step,),
+            )
+            return [row[0] for row in cur.fetchall()]
+        finally:
+            cur.close()
 
 def reset_history_db():
-    """Delete all rows."""
-    conn = db_connect()
-    cur = conn.cursor()
-    try:
-        cur.execute(f"USE {DB_NAME}")
-        cur.execute(f"TRUNCATE TABLE {DB_TABLE}")
-        conn.commit()
-    finally:
-        cur.close()
-        conn.close()
+    """Delete all rows (including sessions still queued for writing)."""
+    if POOL is None:
+        return
+    _WRITE_Q.join()
+    with db_connect() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(f"TRUNCATE TABLE {DB_TABLE}")
+            conn.commit()
+        finally:
+            cur.close()
 
-# Ensure DB and table exist
-db_init()
+# Ensure DB and table exist; keep running without persistence if MySQL is down.
+try:
+    db_init()
+except Exception as e:
+    print(f"MySQL unavailable ({e}). Sessions will not be saved.", file=sys.stderr)
+if POOL is not None:
+    threading.Thread(target=_writer, name="session-writer", daemon=True).start()
+# Drain pending writes before the interpreter exits.
+atexit.register(_WRITE_Q.join)
 
 # ----------------------- Sample Text Library ----------------------- #
 QUOTES = [
@@ -128,14 +277,27 @@ QUOTES = [
     "Talk is cheap. Show me the code.",
 ]
 
+def encode_target(s: str) -> bytes:
+    """Byte form of a target text used by the stats/compare path."""
+    return s.encode("utf-8")
+
+# Encoded once at load so the live path never re-encodes a quote.
+QUOTES_B = tuple(encode_target(q) for q in QUOTES)
+
 COMMON_WORDS = (
     "the of and to in is you that it he was for on are as with his they I at be this have from or one had by word but not what all were we when your can said there use an each which she do how their if will up other about out many then them these so some her would make like him into time has look two more write go see number no way could people my than first water been call who oil its now find long down day did get come made may part"
 ).split()
+COMMON_WORDS = tuple(COMMON_WORDS)
 
 # ----------------------- Utilities ----------------------- #
 
+if os.name == "nt":
+    os.system("")  # one-time call that enables ANSI escape handling in the Windows console
+
 def clear():
-    os.system("cls" if os.name == "nt" else "clear")
+    """Clear the screen with ANSI escapes (no shell subprocess)."""
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
 ANSI_CODES = {
     "RESET": "\033[0m",
@@ -149,74 +311,159 @@ ANSI_CODES = {
 def A(name):
     return ANSI_CODES.get(name, "")
 
+# Pre-bound escapes for the per-character render path.
+_G, _R, _D, _RST = ANSI_CODES["GREEN"], ANSI_CODES["RED"], ANSI_CODES["DIM"], ANSI_CODES["RESET"]
+# Byte forms for frames written straight to sys.stdout.buffer.
+ANSI_BYTES = {name: code.encode("ascii") for name, code in ANSI_CODES.items()}
+
 def wrap(s, width=80):
     """Wrap long lines for nicer display."""
     return textwrap.fill(str(s), width=width)
 
 # ----------------------- Metrics ----------------------- #
 
+try:
+    import numpy as np
+except Exception:
+    np = None  # fall back to the pure-Python comparison loop
+
+# Numba-compiled when available (falls back to NumPy); see _fastcore.py.
+from _fastcore import err_count, mark_mismatch
+
+def _as_text(s):
+    """Decode a bytes target/typed buffer back to str."""
+    return s.decode("utf-8", "replace") if isinstance(s, (bytes, bytearray)) else s
+
+def _as_u8(s):
+    """View an ASCII str/bytes as a uint8 array (no copy for bytes)."""
+    if isinstance(s, str):
+        s = s.encode("ascii")
+    return np.frombuffer(s, np.uint8)
+
 def compute_stats(target, typed, elapsed_sec):
-    """Compute net WPM, raw WPM, accuracy, and errors."""
-    errors = 0
-    for i, ch in enumerate(typed):
-        if i >= len(target) or typed[i] != target[i]:
-            errors += 1
-    if len(typed) < len(target):
-        errors += len(target) - len(typed)
-    correct = max(len(target) - errors, 0)
+    """Compute net WPM, raw WPM, accuracy, and errors.
+
+    target/typed may be str or ASCII bytes (pre-encoded to skip re-encoding).
+    """
+    if np is not None and target.isascii() and typed.isascii():
+        errors = err_count(_as_u8(target), _as_u8(typed))
+    else:
+        target, typed = _as_text(target), _as_text(typed)
+        errors = 0
+        for i, ch in enumerate(typed):
+            if i >= len(target) or typed[i] != target[i]:
+                errors += 1
+        if len(typed) < len(target):
+            errors += len(target) - len(typed)
+    return stats_from_counts(len(target), len(typed), errors, elapsed_sec)
+
+def stats_from_counts(target_len, typed_len, errors, elapsed_sec):
+    """Net WPM, raw WPM, accuracy, and errors from precomputed counts."""
+    correct = max(target_len - errors, 0)
 
     minutes = max(elapsed_sec / 60.0, 1e-6)
-    raw_wpm = (len(typed) / 5.0) / minutes
-    accuracy = correct / max(len(target), 1)
+    raw_wpm = (typed_len / 5.0) / minutes
+    accuracy = correct / max(target_len, 1)
     net_wpm = raw_wpm * accuracy
     return net_wpm, raw_wpm, accuracy, errors
 
-def color_compare(target, typed) -> str:
-    """Color the target string based on correctness vs what was typed."""
-    out = []
-    tlen = len(typed)
-    for i, ch in enumerate(target):
-        if i < tlen:
-            if typed[i] == ch:
-                out.append(f"{A('GREEN')}{ch}{A('RESET')}")
-            else:
-                out.append(f"{A('RED')}{ch}{A('RESET')}")
-        else:
-            out.append(f"{A('DIM')}{ch}{A('RESET')}")
-    if tlen > len(target):
-        extras = typed[len(target):]
-        out.append(f"{A('RED')}{extras}{A('RESET')}")
+# Targets at least this long are colored from a mark_mismatch mask, one escape per run.
+_FAST_COLOR_MIN = 64
+
+def color_compare(target, typed, target_b=None) -> str:
+    """Color the target string based on correctness vs what was typed.
+
+    target_b, the pre-encoded target, feeds the mask path so it is not
+    re-encoded; the rendered text is always sliced from the str target.
+    """
+    if target_b is None:
+        target_b = target
+    if np is not None and len(target) >= _FAST_COLOR_MIN and target_b.isascii() and typed.isascii():
+        mask = mark_mismatch(_as_u8(target_b), _as_u8(typed[:len(target)]))
+        cuts = (np.flatnonzero(mask[1:] != mask[:-1]) + 1).tolist()
+        bounds = [0] + cuts + [len(target)]
+        codes = (_G, _R, _D)  # indexed by CORRECT, WRONG, UNSEEN
+        out = [codes[mask[a]] + target[a:b] + _RST for a, b in zip(bounds, bounds[1:])]
+        if len(typed) > len(target):
+            out.append(_R + typed[len(target):] + _RST)
+        return ''.join(out)
+    m = min(len(target), len(typed))
+    out = [
+        (_G if typed[i] == ch else _R) + ch + _RST
+        for i, ch in enumerate(target[:m])
+    ]
+    if m < len(target):
+        out.append(_D + target[m:] + _RST)
+    elif len(typed) > len(target):
+        out.append(_R + typed[m:] + _RST)
     return ''.join(out)
 
 # ----------------------- Single-key input (for real terminals) ----------------------- #
 
+# Wrap a live session in raw_mode(fd) once; read_key(timeout) then only reads.
+# read_key returns None if no key arrives within `timeout` seconds.
+
 if os.name == 'nt':
     import msvcrt
-    def read_key() -> str:
+    @contextmanager
+    def raw_mode(fd):
+        yield  # msvcrt reads unbuffered keys without changing console modes
+    def read_key(timeout=None) -> str | None:
+        if timeout is not None:
+            deadline = time.perf_counter() + timeout
+            while not msvcrt.kbhit():
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(0.002)
         ch = msvcrt.getwch()
         if ch == '\r':
             return '\n'
         return ch
 else:
-    import termios, tty
-    def read_key() -> str:
-        fd = sys.stdin.fileno()
+    import codecs, select, termios, tty
+    @contextmanager
+    def raw_mode(fd):
+        """Put the terminal in raw mode for the whole block, restoring it after."""
         old = termios.tcgetattr(fd)
         try:
             tty.setraw(fd)
-            ch = sys.stdin.read(1)
+            yield
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old)
-        return ch
+    # Read bytes straight from the fd so select() sees everything still pending.
+    _key_decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    # An invalid byte decodes to U+FFFD plus the next character; the extra
+    # characters wait here so read_key always returns exactly one.
+    _pending_keys = []
+    def read_key(timeout=None) -> str | None:
+        if _pending_keys:
+            return _pending_keys.pop(0)
+        fd = sys.stdin.fileno()
+        if timeout is not None and not select.select([fd], [], [], timeout)[0]:
+            return None
+        chars = ''
+        while not chars:  # a multi-byte character arrives as consecutive bytes
+            chars = _key_decoder.decode(os.read(fd, 1))
+        _pending_keys.extend(chars[1:])
+        return chars[0]
 
 # ----------------------- Render Helpers ----------------------- #
 
+def header(title):
+    return f"{A('BOLD')}{A('CYAN')}== {title} =={A('RESET')}"
+
 def print_header(title):
-    print(f"{A('BOLD')}{A('CYAN')}== {title} =={A('RESET')}")
+    print(header(title))
+
+_BAR_WIDTH = 30
+# Every possible default-width bar, indexed by the number of filled cells.
+_BAR_CACHE = tuple(f"[{('#'*i).ljust(_BAR_WIDTH)}]" for i in range(_BAR_WIDTH + 1))
 
-def progress_bar(p, width=30):
+def progress_bar(p, width=_BAR_WIDTH):
     p = max(0.0, min(1.0, p))
     filled = int(round(p * width))
+    if width == _BAR_WIDTH:
+        return _BAR_CACHE[filled]
     return f"[{('#'*filled).ljust(width)}]"
 
 def print_result(res):
@@ -229,6 +476,9 @@ def print_result(res):
         f" Time:      {res['seconds']:.2f}s\n"
     )
 
+# Below this many cells the plain loop beats NumPy's per-call overhead.
+_NP_CHART_MIN_CELLS = 256
+
 def ascii_chart(values, height=8, width=40):
     """Simple vertical chart for WPM history."""
     if not values:
@@ -238,22 +488,28 @@ def ascii_chart(values, height=8, width=40):
         vmax = vmin + 1.0
     step = max(1, len(values) // width)
     samples = values[::step]
-    rows = []
-    for h in reversed(range(height)):
-        y = vmin + (vmax - vmin) * (h / (height - 1))
-        row = ''.join('█' if v >= y else ' ' for v in samples)
-        rows.append(row)
-    return "\n".join(rows)
+    if np is None or len(samples) * height < _NP_CHART_MIN_CELLS:
+        rows = []
+        for h in reversed(range(height)):
+            y = vmin + (vmax - vmin) * (h / (height - 1))
+            row = ''.join('█' if v >= y else ' ' for v in samples)
+            rows.append(row)
+        return "\n".join(rows)
+    # One broadcast compare builds the whole (height, width) grid.
+    v = np.asarray(samples, dtype=np.float64)
+    ys = vmin + (vmax - vmin) * (np.arange(height - 1, -1, -1) / (height - 1))
+    chars = np.where(v[None, :] >= ys[:, None], '█', ' ')
+    return "\n".join(''.join(r) for r in chars.tolist())
 
 # ----------------------- Modes ----------------------- #
 
 def run_quick_test():
-    target = random.choice(QUOTES)
-    return start_session("Quick Test", target)
+    i = random.randrange(len(QUOTES))
+    return start_session("Quick Test", QUOTES[i], QUOTES_B[i])
 
 def run_random_quote():
-    target = random.choice(QUOTES)
-    return start_session("Random Quote", target)
+    i = random.randrange(len(QUOTES))
+    return start_session("Random Quote", QUOTES[i], QUOTES_B[i])
 
 def run_custom_text():
     clear()
@@ -276,49 +532,206 @@ def run_custom_text():
     return start_session("Custom Text", target)
 
 def run_word_drill(n_words=25):
-    words = [random.choice(COMMON_WORDS) for _ in range(n_words)]
-    target = " ".join(words) + "."
+    target = " ".join(random.choices(COMMON_WORDS, k=n_words)) + "."
     return start_session("Word Drill", target)
 
-def start_session(mode_name, target):
-    return run_realtime_prompt(mode_name, target)
+def start_session(mode_name, target, target_b=None):
+    """Run a live session; target is shown as str, target_b (bytes) feeds the compare path."""
+    if target_b is None:
+        target_b = encode_target(target)
+    return run_realtime_prompt(mode_name, target, target_b)
 
 # ----------------------- Core live prompt ----------------------- #
 
-def run_realtime_prompt(mode_name, target):
-    clear()
-    print_header(f"{mode_name} (Live)")
-    print(f"{A('DIM')}Type the text below. {A('RESET')}{A('YELLOW')}Enter{A('RESET')} to finish, {A('YELLOW')}Esc{A('RESET')} to cancel, {A('YELLOW')}Backspace{A('RESET')} to correct.\n")
-    print(f"{A('BOLD')}Target:{A('RESET')}\n{wrap(target)}\n")
-    typed = []
+# Screen row where the live region starts (below header, instructions, blank line).
+_LIVE_TOP = 4
+# Live view refresh interval (~30 FPS), independent of keystroke rate.
+_FRAME_SEC = 1 / 30
+
+class TypedBuffer:
+    """Live keystroke buffer with a running error count.
+
+    ASCII input is kept in a bytearray (bytes(...) is a memcpy, no join);
+    the first non-ASCII key switches storage to a list of str.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.chars = bytearray()
+        self.deltas = []  # deltas[i] is the error count typed[i] added
+        self.errors = 0
+
+    def __len__(self):
+        return len(self.chars)
+
+    def append(self, ch):
+        i = len(self.chars)
+        delta = 1 if i >= len(self.target) or ch != self.target[i] else 0
+        if isinstance(self.chars, bytearray):
+            if ord(ch) < 128:
+                self.chars.append(ord(ch))
+            else:
+                self.chars = list(self.chars.decode("ascii"))
+                self.chars.append(ch)
+        else:
+            self.chars.append(ch)
+        self.deltas.append(delta)
+        self.errors += delta
+
+    def backspace(self):
+        if self.chars:
+            del self.chars[-1:]
+            self.errors -= self.deltas.pop()
+
+    def text(self):
+        """Typed text as str (for rendering)."""
+        if isinstance(self.chars, bytearray):
+            return self.chars.decode("ascii")
+        return ''.join(self.chars)
+
+    def raw(self):
+        """Typed text as bytes when ASCII-only, else str (for compute_stats)."""
+        if isinstance(self.chars, bytearray):
+            return bytes(self.chars)
+        return ''.join(self.chars)
+
+# Static pieces of the live screen, pre-encoded. Frames go out as one write,
+# and raw mode turns off output newline translation, hence explicit \r\n.
+_LIVE_HELP_B = (
+    f"{A('DIM')}Type the text below. {A('RESET')}{A('YELLOW')}Enter{A('RESET')} to finish, "
+    f"{A('YELLOW')}Esc{A('RESET')} to cancel, {A('YELLOW')}Backspace{A('RESET')} to correct.\r\n\r\n"
+).encode("utf-8")
+_TARGET_LBL_B = ANSI_BYTES["BOLD"] + b"Target:" + ANSI_BYTES["RESET"] + b"\r\n"
+_TYPED_LBL_B = b"\r\n\r\n" + ANSI_BYTES["BOLD"] + b"Your typing:" + ANSI_BYTES["RESET"] + b"\r\n"
+# No trailing newline: the stats line may sit on the terminal's last row.
+_STATS_FMT_B = (
+    b" WPM " + ANSI_BYTES["GREEN"] + b"%.2f" + ANSI_BYTES["RESET"] + b" (raw %.2f)  |  "
+    b"Acc " + ANSI_BYTES["YELLOW"] + b"%.1f%%" + ANSI_BYTES["RESET"] + b"  |  Errors %d  |  Time %.1fs"
+)
+# Visible width budgeted for the stats line (it wraps on narrower terminals).
+_STATS_COLS = 75
+
+def _rows(n, cols):
+    """Terminal rows taken by n visible characters (at least one)."""
+    return max(1, -(-n // cols))
+
+def _fit_live_region(target_len, typed_len, size):
+    """Choose where the live region starts and which text rows fit on screen.
+
+    Returns (top, (ts, te), (us, ue), stats_row, fits): the first row of the
+    region, character slices of the target line and of the typed text cut
+    on row boundaries, the row the stats line lands on, and whether it all
+    fits without scrolling. Long text is windowed; if even one row of each
+    cannot fit below the header, the region takes the whole screen instead.
+    """
+    cols, lines = max(size.columns, 1), size.lines
+    line_len = max(target_len, typed_len)  # the colored line includes overflow
+    stats_rows = _rows(_STATS_COLS, cols)
+    fixed = 4 + stats_rows  # two labels, two blank rows, stats
+    top = _LIVE_TOP if lines - _LIVE_TOP + 1 - fixed >= 2 else 1
+    avail = max(lines - top + 1 - fixed, 2)
+    total_t, total_u = _rows(line_len, cols), _rows(typed_len, cols)
+    t_rows, u_rows = total_t, total_u
+    if t_rows + u_rows > avail:
+        u_rows = min(total_u, max(1, avail // 3))
+        t_rows = min(total_t, avail - u_rows)
+        u_rows = min(total_u, avail - t_rows)
+    # Keep the row being typed on screen, with upcoming text below it.
+    cur_row = min(typed_len, max(line_len - 1, 0)) // cols
+    first = max(0, min(cur_row - t_rows // 2, total_t - t_rows))
+    ts, te = first * cols, (first + t_rows) * cols
+    us = (total_u - u_rows) * cols  # newest typed rows
+    stats_row = top + 4 + t_rows + u_rows
+    fits = stats_row + stats_rows - 1 <= lines
+    return top, (ts, te), (us, typed_len), stats_row, fits
+
+# Control keys dispatch through one table lookup; anything else is typed text.
+_FINISH, _CANCEL = object(), object()
+
+def _enter(typed):
+    return _FINISH
+
+def _esc(typed):
+    return _CANCEL
+
+def _bksp(typed):
+    typed.backspace()
+
+_KEY_HANDLERS = {
+    '\x1b': _esc,
+    '\n': _enter, '\r': _enter,
+    '\x08': _bksp, '\x7f': _bksp,
+}
+
+def run_realtime_prompt(mode_name, target, target_b=None):
+    if target_b is None:
+        target_b = encode_target(target)
+    # Byte slices line up with character slices only for ASCII targets.
+    windowed_b = target_b.isascii()
+    out = sys.stdout.buffer
+    sys.stdout.flush()  # anything printed through the text layer goes first
+    intro = b"".join([
+        b"\x1b[2J\x1b[H", header(f"{mode_name} (Live)").encode("utf-8"), b"\r\n", _LIVE_HELP_B,
+    ])
+    typed = TypedBuffer(target)
     t0 = time.perf_counter()
+    last_paint = float("-inf")
+    dirty = True  # typed text changed since the last full repaint
+    size = None
+    stats_row, fits = _LIVE_TOP, True
     try:
-        while True:
-            elapsed = max(time.perf_counter() - t0, 1e-6)
-            current = ''.join(typed)
-            wpm, raw, acc, errs = compute_stats(target[:len(current)], current, elapsed)
-
-            clear()
-            print_header(f"{mode_name} (Live)")
-            print(f"{A('BOLD')}Target:{A('RESET')}\n{color_compare(target, current)}\n")
-            print(f"{A('BOLD')}Your typing:{A('RESET')}\n{current}\n")
-            print(
-                f" WPM {A('GREEN')}{wpm:.2f}{A('RESET')} (raw {raw:.2f})  |  "
-                f"Acc {A('YELLOW')}{acc*100:.1f}%{A('RESET')}  |  Errors {errs}  |  Time {elapsed:.1f}s"
-            )
-
-            ch = read_key()
-            if ch == '\x1b':  # ESC
-                raise KeyboardInterrupt
-            elif ch == '\n':  # Enter
-                break
-            elif ch in ('\x08', '\x7f'):  # Backspace
-                if typed:
-                    typed.pop()
-            elif ch == '\r':
-                break
-            else:
-                typed.append(ch)
+        with raw_mode(sys.stdin.fileno()):
+            while True:
+                # Repaint at most _FRAME_SEC apart; key bursts in between are only buffered.
+                now = time.perf_counter()
+                if now - last_paint >= _FRAME_SEC:
+                    last_paint = now
+                    elapsed = max(now - t0, 1e-6)
+                    wpm, raw, acc, errs = stats_from_counts(
+                        min(len(typed), len(target)), len(typed), typed.errors, elapsed
+                    )
+                    stats = _STATS_FMT_B % (wpm, raw, acc * 100, errs, elapsed)
+
+                    new_size = shutil.get_terminal_size()
+                    if new_size != size:
+                        # First frame or a resize: redraw everything, header included.
+                        out.write(intro)
+                        size, dirty = new_size, True
+                    if dirty:
+                        # Header and instructions stay put; only repaint the live region below them.
+                        dirty = False
+                        current = typed.text()
+                        top, (ts, te), (us, ue), stats_row, fits = _fit_live_region(
+                            len(target), len(current), size
+                        )
+                        out.write(b"".join([
+                            b"\x1b[%d;1H\x1b[J" % top,
+                            _TARGET_LBL_B,
+                            color_compare(
+                                target[ts:te], current[ts:te], target_b[ts:te] if windowed_b else None
+                            ).encode("utf-8"),
+                            _TYPED_LBL_B, current[us:ue].encode("utf-8"),
+                            b"\r\n\r\n", stats,
+                        ]))
+                    elif fits:
+                        # Idle tick: only the timer moved, so rewrite just the stats line.
+                        out.write(b"\x1b[%d;1H\x1b[J" % stats_row + stats)
+                    out.flush()
+
+                # Wake up for the next frame even if idle, so the timer keeps ticking.
+                ch = read_key(timeout=max(_FRAME_SEC - (time.perf_counter() - last_paint), 0.0))
+                if ch is None:
+                    continue
+                dirty = True
+                handler = _KEY_HANDLERS.get(ch)
+                if handler is None:
+                    typed.append(ch)
+                    continue
+                action = handler(typed)
+                if action is _FINISH:
+                    break
+                if action is _CANCEL:
+                    raise KeyboardInterrupt
     except KeyboardInterrupt:
         # Treat as canceled session
         return {
@@ -333,8 +746,7 @@ def run_realtime_prompt(mode_name, target):
         }
 
     elapsed = time.perf_counter() - t0
-    final = ''.join(typed)
-    wpm, raw, acc, errs = compute_stats(target, final, elapsed)
+    wpm, raw, acc, errs = compute_stats(target_b, typed.raw(), elapsed)
     return {
         "mode": mode_name+" (Live)",
         "wpm": wpm,
@@ -348,23 +760,24 @@ def run_realtime_prompt(mode_name, target):
 
 # ----------------------- History Views ----------------------- #
 
-def view_progress(history):
-    """Show best WPM, avg of last 10, and chart (uses what's in memory now)."""
+def view_progress():
+    """Show best WPM, avg of last 10, and chart (reductions are done in MySQL)."""
     clear()
     print_header("Progress")
-    if not history:
+    # Make sure sessions still in the write queue are visible.
+    _WRITE_Q.join()
+    agg = load_aggregates(recent=10)
+    if not agg["count"]:
         print("No history yet. Complete a test to see your progress.\n")
         input("Press Enter to return to menu...")
         return
 
-    last = history[-10:]
-    best = max(history, key=lambda r: r["wpm"])
-    avg = sum(r["wpm"] for r in last) / len(last)
+    last = load_recent(10)
 
-    print(f"Best WPM: {A('GREEN')}{best['wpm']:.2f}{A('RESET')} ({best['mode']})")
-    print(f"Avg (last {len(last)}): {A('YELLOW')}{avg:.2f}{A('RESET')}\n")
+    print(f"Best WPM: {A('GREEN')}{agg['best_wpm']:.2f}{A('RESET')} ({agg['best_mode']})")
+    print(f"Avg (last {len(last)}): {A('YELLOW')}{agg['avg_recent']:.2f}{A('RESET')}\n")
 
-    values = [r["wpm"] for r in history]
+    values = load_chart_values(agg["count"], width=50)
     chart = ascii_chart(values, height=8, width=50)
     print(chart)
 
@@ -384,8 +797,6 @@ def reset_history():
 # ----------------------- Menu ----------------------- #
 
 def main_menu():
-    # Load existing sessions from MySQL at startup to display progress.
-    history = load_history()
     while True:
         clear()
         print_header("Typing Trainer — CLI")
@@ -416,13 +827,11 @@ def main_menu():
             if res is None:
                 continue
         elif choice == "5":
-            # Reload from DB to reflect any changes made outside this run too
-            history = load_history()
-            view_progress(history)
+            # Always read from DB to reflect any changes made outside this run too
+            view_progress()
             continue
         elif choice == "6":
             reset_history()
-            history = []
             continue
         elif choice == "7":
             print("Goodbye!")
@@ -432,12 +841,11 @@ def main_menu():
             time.sleep(1)
             continue
 
-        # Show result, save to DB, and update in-memory history for this run
+        # Show result and save to DB
         clear()
         print_header("Session Complete")
         print_result(res)
         save_session(res)
-        history.append(res)
         input("Press Enter to return to menu...")
 
 if __name__ == "__main__":
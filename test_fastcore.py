@@ -0,0 +1,44 @@
+"""Check the _fastcore kernels (JIT, NumPy, or reference) against the pure-Python reference."""
+
+import random
+
+import pytest
+
+import _fastcore
+from _fastcore import _err_count_ref, _mark_mismatch_ref, err_count, mark_mismatch
+
+np = _fastcore.np
+
+
+def _random_pairs(n=200, seed=0):
+    rng = random.Random(seed)
+    alphabet = b"abc ."
+    for _ in range(n):
+        t = bytes(rng.choice(alphabet) for _ in range(rng.randrange(0, 40)))
+        u = bytes(rng.choice(alphabet) for _ in range(rng.randrange(0, 40)))
+        yield t, u
+
+
+def _buf(b):
+    return np.frombuffer(b, np.uint8) if np is not None else b
+
+
+def test_err_count_matches_reference():
+    for t, u in _random_pairs():
+        assert err_count(_buf(t), _buf(u)) == _err_count_ref(t, u), (t, u)
+
+
+def test_mark_mismatch_matches_reference():
+    for t, u in _random_pairs():
+        got = mark_mismatch(_buf(t), _buf(u))
+        assert list(got) == _mark_mismatch_ref(t, u, [0] * len(t)), (t, u)
+
+
+def test_numpy_kernels_match_reference():
+    if np is None:
+        pytest.skip("numpy not installed")
+    for t, u in _random_pairs(seed=1):
+        ta, ua = _buf(t), _buf(u)
+        assert _fastcore._err_count_np(ta, ua) == _err_count_ref(t, u), (t, u)
+        got = _fastcore._mark_mismatch_np(ta, ua, np.empty(len(t), np.uint8))
+        assert got.tolist() == _mark_mismatch_ref(t, u, [0] * len(t)), (t, u)